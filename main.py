@@ -2,16 +2,19 @@
 import asyncio
 import random
 import math
+import os
 
 from loguru import logger
 
 from models.swarm import Swarm
 from models.droneposition import DronePosition
+from models.evaporation import parse_evaporation
 from stigmergy import Stigmergy
 # --------------------
 
 # --- GLOBAL VARIABLES ---
 VIRTUAL_TARGET = None   # virtual target generated on working field
+EVAPORATION = os.environ.get("STIGMERGY_EVAPORATION")   # pheromone evaporation model, e.g. "exponential:rate=0.1" (see `parse_evaporation`)
 # ------------------------
 
 # --- FUNCTIONS ---
@@ -59,7 +62,8 @@ async def main():
 
     # run simulation
     spawns = await swarm.positions
-    stigmergy_simulation = Stigmergy(swarm, spawns[0])
+    evaporation = parse_evaporation(EVAPORATION) if EVAPORATION else None
+    stigmergy_simulation = Stigmergy(swarm, spawns[0], evaporation=evaporation)
     await stigmergy_simulation.start()
 
 if __name__ == "__main__":
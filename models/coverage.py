@@ -0,0 +1,131 @@
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+
+class CoverageMap:
+    """
+    Shared visit-time grid of the working field, used to plan the exploration of the swarm.
+
+    Every patch stores the last time a drone flew over it (0 if never visited).
+    Patches are kept in a min-heap keyed by their visit time, so the stalest
+    (or unvisited) patch is retrieved in O(log cells).
+    Each drone can claim one patch at a time: claimed patches are skipped by the
+    other drones until the patch is visited or the claim is released.
+    Among equally stale patches (e.g. the never visited ones), the nearest to the drone is claimed.
+    """
+    def __init__(self, total_patches:int) -> None:
+        self.total_patches = total_patches
+        self.__visited_at: List[List[float]] = [[0.0 for _ in range(total_patches)] for _ in range(total_patches)]
+        self.__heap: List[Tuple[float, int, int]] = []
+        self.__claims: Dict[Tuple[int, int], int] = {}      # patch -> drone index
+        self.__claimed_by: Dict[int, Tuple[int, int]] = {}  # drone index -> patch
+        self.__rebuild_heap()
+
+    def __rebuild_heap(self) -> None:
+        """
+        Rebuilds the heap from the grid, discarding outdated entries
+        """
+        self.__heap = [(t, x, y) for x, row in enumerate(self.__visited_at) for y, t in enumerate(row)]
+        heapq.heapify(self.__heap)
+
+    def last_visit(self, x_index:int, y_index:int) -> float:
+        """
+        Get the last visit time of the patch (0 if never visited)
+        """
+        return self.__visited_at[x_index][y_index]
+
+    def visit(self, x_index:int, y_index:int, timestamp:float=None) -> None:
+        """
+        Marks the patch as visited at `timestamp` (defaults to now) and drops any claim on it.
+        Positions outside the working field are ignored.
+        """
+        if not (0 <= x_index < self.total_patches and 0 <= y_index < self.total_patches):
+            return
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        self.__visited_at[x_index][y_index] = timestamp
+        heapq.heappush(self.__heap, (timestamp, x_index, y_index))
+
+        index = self.__claims.pop((x_index, y_index), None)
+        if index is not None:
+            del self.__claimed_by[index]
+
+        # outdated entries are discarded lazily: compact once they dominate the heap
+        if len(self.__heap) > 2 * self.total_patches * self.total_patches:
+            self.__rebuild_heap()
+
+    def __claimable(self, cell:Tuple[int, int], previous:Optional[Tuple[int, int]]) -> bool:
+        return cell not in self.__claims and cell != previous
+
+    def __nearest_tied(self,
+                       cell:Tuple[int, int],
+                       near:Tuple[int, int],
+                       previous:Optional[Tuple[int, int]]) -> Tuple[int, int]:
+        """
+        Searches, ring by ring around `near`, a claimable patch as stale as `cell` and closer to `near`.
+        The search stops at the (Chebyshev) distance of `cell`, so it never scans farther than the heap pick.
+        """
+        timestamp = self.__visited_at[cell[0]][cell[1]]
+        near_x, near_y = near
+        max_radius = max(abs(cell[0] - near_x), abs(cell[1] - near_y))
+        for r in range(max_radius):
+            for x_index in range(near_x - r, near_x + r + 1):
+                if not 0 <= x_index < self.total_patches:
+                    continue
+                # whole rows on the ring borders, only the two ends in between
+                step = 1 if abs(x_index - near_x) == r else max(2 * r, 1)
+                for y_index in range(near_y - r, near_y + r + 1, step):
+                    if (0 <= y_index < self.total_patches
+                            and self.__visited_at[x_index][y_index] == timestamp
+                            and self.__claimable((x_index, y_index), previous)):
+                        return (x_index, y_index)
+        return cell
+
+    def claim(self, index:int, near:Tuple[int, int]=None) -> Optional[Tuple[int, int]]:
+        """
+        Assigns the stalest unclaimed patch to the drone identified by its `index`,
+        releasing the patch it previously claimed (which is not assigned again).
+        Ties are broken by distance from the patch `near` (the one the drone is flying over), if given.
+
+        Returns:
+            Tuple[int, int]: patch coordinates, None if every other patch is already claimed
+        """
+        previous = self.release(index)
+
+        skipped = []
+        cell = None
+        while self.__heap:
+            entry = heapq.heappop(self.__heap)
+            timestamp, x_index, y_index = entry
+            if timestamp != self.__visited_at[x_index][y_index]:
+                # outdated entry, the patch has been visited since
+                continue
+            skipped.append(entry)
+            if self.__claimable((x_index, y_index), previous):
+                cell = (x_index, y_index)
+                break
+
+        # claimed patches stay in the heap until they are visited
+        for entry in skipped:
+            heapq.heappush(self.__heap, entry)
+
+        if cell is not None and near is not None:
+            cell = self.__nearest_tied(cell, near, previous)
+
+        if cell is not None:
+            self.__claims[cell] = index
+            self.__claimed_by[index] = cell
+        return cell
+
+    def release(self, index:int) -> Optional[Tuple[int, int]]:
+        """
+        Releases the patch claimed by the drone identified by its `index`, if any
+
+        Returns:
+            Tuple[int, int]: coordinates of the released patch, None if no patch was claimed
+        """
+        cell = self.__claimed_by.pop(index, None)
+        if cell is not None:
+            del self.__claims[cell]
+        return cell
@@ -1,6 +1,8 @@
 import math
-from typing import List
-from mavsdk import telemetry
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mavsdk import telemetry
 
 def deg_to_m(deg) -> float:
     """
@@ -30,7 +32,7 @@ class DronePosition:
         self.absolute_altitude_m = absolute_altitude_m
     
     @classmethod
-    def from_mavsdk_position(cls, pos:telemetry.Position) -> None:
+    def from_mavsdk_position(cls, pos:'telemetry.Position') -> None:
         """
         Defines the instance retrieving info by a Position object of MavSDK.
 
@@ -80,4 +82,18 @@ class DronePosition:
         new_lat = self.latitude_deg + m_to_deg(lat_increment_m)
         new_lon = self.longitude_deg + m_to_deg(long_increment_m)
         new_alt = self.absolute_altitude_m + alt_increment_m
-        return DronePosition(new_lat, new_lon, new_alt)
\ No newline at end of file
+        return DronePosition(new_lat, new_lon, new_alt)
+
+    def distance_m(self, other:'DronePosition') -> float:
+        """
+        Horizontal distance between the current position and `other`
+
+        Args:
+            other (DronePosition): position to measure the distance to
+
+        Returns:
+            float: distance [m]
+        """
+        d_lat_m = deg_to_m(self.latitude_deg - other.latitude_deg)
+        d_lon_m = deg_to_m(self.longitude_deg - other.longitude_deg)
+        return math.hypot(d_lat_m, d_lon_m)
\ No newline at end of file
@@ -0,0 +1,126 @@
+import math
+
+from abc import ABC, abstractmethod
+
+class EvaporationModel(ABC):
+    """
+    Closed-form intensity of a pheromone as a function of the time elapsed since its release.
+
+    Assuming:
+    - start intensity = 1
+    - intensity drops to 0 once `lifetime` has elapsed
+    """
+
+    @abstractmethod
+    def lifetime(self) -> float:
+        """
+        Time [s] after the release when the pheromone vanishes
+        """
+        pass
+
+    @abstractmethod
+    def _intensity(self, elapsed:float) -> float:
+        pass
+
+    def intensity(self, elapsed:float) -> float:
+        """
+        Intensity of the pheromone `elapsed` seconds after its release
+        """
+        if elapsed >= self.lifetime():
+            return 0
+        return self._intensity(max(elapsed, 0))
+
+
+class LinearEvaporation(EvaporationModel):
+    """
+    intensity(t) = 1 - rate * t
+    """
+    def __init__(self, rate:float=0.05) -> None:
+        if not rate > 0:
+            raise ValueError(f"Evaporation rate must be positive, got {rate}")
+        self.rate = rate
+
+    def lifetime(self) -> float:
+        return 1 / self.rate
+
+    def _intensity(self, elapsed:float) -> float:
+        return 1 - self.rate * elapsed
+
+
+class ExponentialEvaporation(EvaporationModel):
+    """
+    intensity(t) = exp(-rate * t), dropped to 0 once it falls below `threshold`
+    """
+    def __init__(self, rate:float=0.15, threshold:float=0.05) -> None:
+        if not rate > 0:
+            raise ValueError(f"Evaporation rate must be positive, got {rate}")
+        if not 0 < threshold < 1:
+            raise ValueError(f"Threshold must be in (0, 1), got {threshold}")
+        self.rate = rate
+        self.threshold = threshold
+
+    def lifetime(self) -> float:
+        return math.log(1 / self.threshold) / self.rate
+
+    def _intensity(self, elapsed:float) -> float:
+        return math.exp(-self.rate * elapsed)
+
+
+class HalfLifeEvaporation(EvaporationModel):
+    """
+    intensity(t) = 0.5 ^ (t / half_life), dropped to 0 once it falls below `threshold`
+    """
+    def __init__(self, half_life:float=5, threshold:float=0.05) -> None:
+        if not half_life > 0:
+            raise ValueError(f"Half-life must be positive, got {half_life}")
+        if not 0 < threshold < 1:
+            raise ValueError(f"Threshold must be in (0, 1), got {threshold}")
+        self.half_life = half_life
+        self.threshold = threshold
+
+    def lifetime(self) -> float:
+        return self.half_life * math.log2(1 / self.threshold)
+
+    def _intensity(self, elapsed:float) -> float:
+        return 0.5 ** (elapsed / self.half_life)
+
+
+EVAPORATION_MODELS = {
+    "linear": LinearEvaporation,
+    "exponential": ExponentialEvaporation,
+    "half-life": HalfLifeEvaporation,
+}
+
+def make_evaporation(name:str, **params) -> EvaporationModel:
+    """
+    Creates the evaporation model registered as `name` (see `EVAPORATION_MODELS`) with the given parameters,
+    so that models can be selected and swept from configuration.
+
+    Raises:
+        ValueError: unknown evaporation model or parameters
+    """
+    try:
+        model = EVAPORATION_MODELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown evaporation model '{name}', expected one of {list(EVAPORATION_MODELS)}")
+    try:
+        return model(**params)
+    except TypeError as e:
+        raise ValueError(f"Invalid parameters for evaporation model '{name}': {e}")
+
+def parse_evaporation(spec:str) -> EvaporationModel:
+    """
+    Creates an evaporation model from a `name[:param=value,...]` specification,
+    e.g. `exponential:rate=0.1,threshold=0.01` or `half-life:half_life=8`
+
+    Raises:
+        ValueError: malformed specification, unknown evaporation model or invalid parameters
+    """
+    name, _, params_spec = spec.partition(":")
+    params = {}
+    for param in filter(None, params_spec.split(",")):
+        key, sep, value = param.partition("=")
+        if not sep:
+            raise ValueError(f"Malformed evaporation parameter '{param}', expected param=value")
+        params[key.strip()] = float(value)
+    return make_evaporation(name.strip(), **params)
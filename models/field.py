@@ -0,0 +1,180 @@
+import heapq
+import itertools
+import time
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Tuple
+from models.patch import Patch
+from models.pheromone import Pheromone
+
+class Field(ABC):
+    """
+    Quantized square map, divided in `total_patches` x `total_patches` patches.
+
+    Exposes the operations used by `Stigmergy` (add, count, list, tick, filter)
+    regardless of how patches are stored. Subclasses define the storage.
+    Patch indices outside the working field are ignored: they hold no pheromones
+    and nothing can be released on them.
+    Expiry times of the pheromones are kept in a min-heap, so that a tick
+    only touches the patches where some pheromone actually vanished.
+    Active pheromones are counted by releasing drone, so that `count_released_by` is O(1).
+    """
+    def __init__(self, total_patches:int) -> None:
+        self.total_patches = total_patches
+        self.__expiries: List[Tuple[float, int, int, int]] = []   # (expires_at, seq, x, y)
+        self.__seq = itertools.count()
+        self.__released_counts: Dict[int, int] = {}   # drone index -> active pheromones released
+
+    def in_field(self, x_index:int, y_index:int) -> bool:
+        """
+        Check if (`x_index`, `y_index`) are patch coordinates inside the working field
+        """
+        return 0 <= x_index < self.total_patches and 0 <= y_index < self.total_patches
+
+    @abstractmethod
+    def _get_patch(self, x_index:int, y_index:int, create:bool=False) -> Optional[Patch]:
+        """
+        Get the patch at (`x_index`, `y_index`), allocating it if `create`.
+        Returns None if the patch holds no pheromones and is not stored.
+        """
+        pass
+
+    def _release_patch(self, x_index:int, y_index:int) -> None:
+        pass
+
+    @abstractmethod
+    def items(self) -> Iterator[Tuple[Tuple[int, int], Patch]]:
+        """
+        Iterates over the ((x, y), patch) pairs which may hold pheromones
+        """
+        pass
+
+    def add_pheromone(self, x_index:int, y_index:int, pheromone:Pheromone) -> bool:
+        """
+        Add a new pheromone in the patch at (`x_index`, `y_index`)
+
+        Returns:
+            bool: False if the patch is outside the working field and the pheromone was not added
+        """
+        if not self.in_field(x_index, y_index):
+            return False
+        self._get_patch(x_index, y_index, create=True).add_pheromone(pheromone)
+        heapq.heappush(self.__expiries, (pheromone.expires_at, next(self.__seq), x_index, y_index))
+        self.__released_counts[pheromone.released_by] = self.__released_counts.get(pheromone.released_by, 0) + 1
+        return True
+
+    def count_released_by(self, index:int) -> int:
+        """
+        Return number of active pheromones released by the drone identified by its `index`
+        """
+        return self.__released_counts.get(index, 0)
+
+    def count_items(self, x_index:int, y_index:int) -> int:
+        """
+        Return number of pheromones released in the patch at (`x_index`, `y_index`)
+        """
+        if not self.in_field(x_index, y_index):
+            return 0
+        patch = self._get_patch(x_index, y_index)
+        return patch.count_items() if patch is not None else 0
+
+    def get_pheromones(self, x_index:int, y_index:int) -> List[Pheromone]:
+        """
+        Lists all the pheromones released in the patch at (`x_index`, `y_index`)
+        """
+        if not self.in_field(x_index, y_index):
+            return []
+        patch = self._get_patch(x_index, y_index)
+        return patch.get_pheromones() if patch is not None else []
+
+    def tick(self) -> int:
+        """
+        Removes the pheromones which vanished since the last tick.
+        Intensities are computed when read, so pheromones still active are not touched.
+
+        Returns:
+            int: number of pheromones removed
+        """
+        now = time.monotonic()
+        removed = 0
+        while self.__expiries and self.__expiries[0][0] <= now:
+            _, _, x_index, y_index = heapq.heappop(self.__expiries)
+            removed += self._filter_patch(x_index, y_index, now)
+        return removed
+
+    def filter_pheromones(self) -> int:
+        """
+        Remove all pheromones which expired (`Pheromone.expires_at` reached), scanning every patch.
+        `tick` only filters the patches where some pheromone is due to expire.
+
+        Returns:
+            int: number of pheromones removed
+        """
+        now = time.monotonic()
+        removed = 0
+        for x_index, y_index in [coords for coords, _ in self.items()]:
+            removed += self._filter_patch(x_index, y_index, now)
+        return removed
+
+    def _filter_patch(self, x_index:int, y_index:int, now:float) -> int:
+        patch = self._get_patch(x_index, y_index)
+        if patch is None:
+            return 0
+        removed = patch.filter_pheromones(now)
+        for pheromone in removed:
+            count = self.__released_counts[pheromone.released_by] - 1
+            if count > 0:
+                self.__released_counts[pheromone.released_by] = count
+            else:
+                del self.__released_counts[pheromone.released_by]
+        if patch.count_items() == 0:
+            self._release_patch(x_index, y_index)
+        return len(removed)
+
+
+class DenseField(Field):
+    """
+    Field storing every patch in a `total_patches` x `total_patches` matrix.
+    Suitable for small working fields.
+    """
+    def __init__(self, total_patches:int) -> None:
+        super().__init__(total_patches)
+        self.__patches: List[List[Patch]] = [[Patch() for _ in range(total_patches)] for _ in range(total_patches)]
+
+    def _get_patch(self, x_index:int, y_index:int, create:bool=False) -> Patch:
+        return self.__patches[x_index][y_index]
+
+    def items(self) -> Iterator[Tuple[Tuple[int, int], Patch]]:
+        for i, row in enumerate(self.__patches):
+            for j, patch in enumerate(row):
+                yield (i, j), patch
+
+
+class SparseField(Field):
+    """
+    Field storing only the patches holding at least one pheromone.
+    A patch is allocated when a pheromone is released on it and freed once
+    all its pheromones have evaporated, so memory scales with the active
+    pheromones rather than with the field area.
+    """
+    def __init__(self, total_patches:int) -> None:
+        super().__init__(total_patches)
+        self.__patches: Dict[Tuple[int, int], Patch] = {}
+
+    def _get_patch(self, x_index:int, y_index:int, create:bool=False) -> Optional[Patch]:
+        patch = self.__patches.get((x_index, y_index))
+        if patch is None and create:
+            patch = self.__patches[(x_index, y_index)] = Patch()
+        return patch
+
+    def _release_patch(self, x_index:int, y_index:int) -> None:
+        self.__patches.pop((x_index, y_index), None)
+
+    def items(self) -> Iterator[Tuple[Tuple[int, int], Patch]]:
+        return iter(list(self.__patches.items()))
+
+    def __len__(self) -> int:
+        """
+        Number of active patches
+        """
+        return len(self.__patches)
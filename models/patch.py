@@ -1,3 +1,5 @@
+import time
+
 from typing import List
 from models.pheromone import Pheromone
 
@@ -17,11 +19,19 @@ class Patch:
         """
         self.__pheromones.append(pheromone)
 
-    def filter_pheromones(self) -> None:
-        """
-        Remove all pheromones which intensity reached 0 value
+    def filter_pheromones(self, now:float=None) -> List[Pheromone]:
         """
-        self.__pheromones = [p for p in self.__pheromones if p.get_intensity > 0]
+        Remove all pheromones vanished at the time.monotonic() timestamp `now` (defaults to now)
+
+        Returns:
+            List[Pheromone]: removed pheromones
+        """
+        if now is None:
+            now = time.monotonic()
+        removed = [p for p in self.__pheromones if p.is_expired(now)]
+        if removed:
+            self.__pheromones = [p for p in self.__pheromones if not p.is_expired(now)]
+        return removed
 
     def get_pheromones(self) -> List[Pheromone]:
         """
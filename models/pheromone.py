@@ -1,51 +1,60 @@
+import time
+
+from models.evaporation import EvaporationModel, LinearEvaporation
+
 class Pheromone:
     """
     Assuming:
     - start intensity = 1
-    - tick interval = 1s 
+    - intensity evaluated lazily from the release time through the `evaporation` model
     """
 
-    def __init__(self):
-        self.__intensity = 1                # intensity of the pheromone (1 when released)
+    def __init__(self, evaporation:EvaporationModel=None, released_at:float=None):
         # self.__center_x = None              # X coord. of the matrix where it will be released
         # self.__center_y = None              # Y coord. of the matrix where it will be released
         # self.__radius_top = 1               # top radius indicating where intensity(r, k) = intensity(0, k)
         # self.__radius_down = 1              # down radius indicating where intensity decreases gradually between top radius and down radius, and drops to 0 after down radius
-        self.__deltaEvaporate = None        # delta(r) = evapRate * intensity(r,0)
-        self.__evapRate = 0.05               # rate for the evaporation: in 20 sec the pheromone vanishes (because intensity(0, 0) = 1 -> intensity(0, 20) = 0)
+        # default evaporation: in 20 sec the pheromone vanishes (because intensity(0, 0) = 1 -> intensity(0, 20) = 0)
+        self.__evaporation = evaporation if evaporation is not None else LinearEvaporation(0.05)
+        self.__released_at = released_at if released_at is not None else time.monotonic()   # time.monotonic() timestamp [s]
         # self.__olfactory_habituation = 10    # 10sec
         self.__released_by = None
 
-    def tick(self) -> bool:
+    def is_expired(self, now:float=None) -> bool:
         """
-        Updates intensity value as time goes by.
-        Called by `Stigmergy` parent class.
-        
-        Returns: 
-        - True if Pheromone is still active
-        - False if Pheromone has reached 0 `intensity` value
+        Check if the pheromone vanished at the time.monotonic() timestamp `now` (defaults to now)
         """
-        self.__deltaEvaporate = self.__evapRate * 1
-        self.__intensity -= self.__deltaEvaporate
-        return self.__intensity > 0
-    
+        if now is None:
+            now = time.monotonic()
+        return now >= self.expires_at
+
     @property
     def get_intensity(self) -> float:
         """
         Get current intensity value at its center
         """
-        return self.__intensity
-    
+        now = time.monotonic()
+        if self.is_expired(now):
+            return 0
+        return self.__evaporation.intensity(now - self.__released_at)
+
+    @property
+    def expires_at(self) -> float:
+        """
+        Get the time.monotonic() timestamp when the pheromone vanishes
+        """
+        return self.__released_at + self.__evaporation.lifetime()
+
     @property
     def released_by(self) -> int:
         """
         Get index of the drone which released the pheromone
         """
         return self.__released_by
-    
+
     @released_by.setter
     def released_by(self, value:int):
         """
         Set index of the drone which released the pheromone
         """
-        self.__released_by = value
\ No newline at end of file
+        self.__released_by = value
@@ -2,7 +2,7 @@ from loguru import logger
 from pprint import pprint
 from mavsdk import System
 import asyncio
-from typing import List, Callable
+from typing import List, Callable, Optional
 from utils.systemwrapper import SystemWrapper
 from models.droneposition import DronePosition
 
@@ -21,11 +21,21 @@ class Swarm:
     """
 
     next_drone_address = 14540 
+    arrival_tolerance_m = 1.0   # horizontal distance under which a drone is considered arrived
+    arrival_poll_s = 0.2        # interval between two checks of the cached position while awaiting arrival
+    telemetry_retry_s = 1       # delay before subscribing again to a failed telemetry stream
+    telemetry_stale_s = 3       # age after which a cached position is stale and the stream is subscribed again
+    position_rate_hz = 10       # rate requested for the position telemetry
     def __init__(self,
                 drones_number:int,
                 drones_addrs:List[int]=None) -> None:
         self.__drones_number = drones_number
         self.__positions = []
+        self.__cached_positions:List[Optional[DronePosition]] = []
+        self.__cached_at:List[float] = []                   # loop time of each cached position
+        self.__position_events:List[asyncio.Event] = []     # set while the cached position is valid
+        self.__telemetry_tasks:List[asyncio.Task] = []
+        self.__position_listeners:List[Callable[[int, DronePosition], None]] = []
         self.__drones:List[System] = []
 
         if drones_addrs == None:
@@ -52,6 +62,84 @@ class Swarm:
             logger.info(f"Connection to drone@{a} completed")
             self.__drones.append(drone)
 
+        self.__cached_positions = [None] * len(self.__drones)
+        self.__cached_at = [0.0] * len(self.__drones)
+        self.__position_events = [asyncio.Event() for _ in self.__drones]
+        self.__telemetry_tasks = [asyncio.ensure_future(self.__track_position(n, d)) for n, d in enumerate(self.__drones)]
+
+    async def __track_position(self, index, drone:System):
+        """
+        Keeps the cached position of the drone identified by its index updated with its telemetry stream.
+        This is the only position stream opened on the drone: MAVSDK keeps one position subscription
+        per drone, so any other stream would silently take it over.
+        If the stream fails or goes silent for `telemetry_stale_s`, the cached position is invalidated
+        and the stream is subscribed again.
+        """
+        try:
+            await drone.telemetry.set_rate_position(Swarm.position_rate_hz)
+        except Exception as e:
+            logger.warning(f"Could not set position rate of drone@{self.drones_addrs[index]}: {e}")
+
+        while True:
+            stream = drone.telemetry.position()
+            try:
+                while True:
+                    p = await asyncio.wait_for(anext(stream), Swarm.telemetry_stale_s)
+                    self.__cache_position(index, DronePosition.from_mavsdk_position(p))
+            except asyncio.CancelledError:
+                return
+            except asyncio.TimeoutError:
+                logger.warning(f"No position telemetry from drone@{self.drones_addrs[index]} in {Swarm.telemetry_stale_s}s, subscribing again")
+            except StopAsyncIteration:
+                logger.warning(f"Position telemetry of drone@{self.drones_addrs[index]} ended, subscribing again")
+            except Exception as e:
+                logger.error(f"Position telemetry of drone@{self.drones_addrs[index]} failed: {e}")
+            finally:
+                try:
+                    await stream.aclose()
+                except Exception:
+                    pass
+            self.__cached_positions[index] = None
+            self.__position_events[index].clear()
+            await asyncio.sleep(Swarm.telemetry_retry_s)
+
+    def __cache_position(self, index, pos:DronePosition):
+        """
+        Stores a new position of the drone identified by its index and notifies the listeners
+        """
+        self.__cached_positions[index] = pos
+        self.__cached_at[index] = asyncio.get_running_loop().time()
+        self.__position_events[index].set()
+        for listener in self.__position_listeners:
+            listener(index, pos)
+
+    def __fresh_position(self, index) -> Optional[DronePosition]:
+        """
+        Get the cached position of the drone identified by its index, None if missing or stale
+        """
+        if not self.__cached_positions or self.__cached_positions[index] is None:
+            return None
+        if asyncio.get_running_loop().time() - self.__cached_at[index] > Swarm.telemetry_stale_s:
+            return None
+        return self.__cached_positions[index]
+
+    def add_position_listener(self, listener:Callable[[int, DronePosition], None]):
+        """
+        Registers a `listener(index, position)` called on every telemetry position received from a drone
+        """
+        self.__position_listeners.append(listener)
+
+    def stop_telemetry(self):
+        """
+        Stops the telemetry streams feeding the cached positions
+        """
+        for t in self.__telemetry_tasks:
+            t.cancel()
+        self.__telemetry_tasks = []
+        self.__cached_positions = []
+        self.__cached_at = []
+        self.__position_events = []
+
 
     async def check_system_connections(self) -> bool:
         """
@@ -93,14 +181,25 @@ class Swarm:
             await d.action.land()
         logger.info("Landing completed")
 
+        self.stop_telemetry()
+
     @property
     async def positions(self) -> List[DronePosition]:
         """
-        Retrieves drones positions
+        Retrieves drones positions.
+        While the telemetry streams are running, the cached positions are used
+        (waiting for the first position of each drone); the drones are polled otherwise.
 
         Returns:
             List[DronePosition]: Current position of each drone
         """
+        if self.__telemetry_tasks:
+            # a position may be invalidated again while waiting for the others
+            while None in self.__cached_positions:
+                await asyncio.gather(*[e.wait() for e in self.__position_events])
+            self.__positions = list(self.__cached_positions)
+            return self.__positions
+
         self.__positions = []
         for d in self.__drones:
             p = await anext(d.telemetry.position())
@@ -114,13 +213,74 @@ class Swarm:
         Sets a new position (`target_position`) for the drone identified by its index
         """
         try:
-            prev_pos = self.__positions[index]
             drone = self.__drones[index]
         except IndexError:
             return
-        
+
+        prev_pos = self.__fresh_position(index)
+        if prev_pos is None and index < len(self.__positions):
+            prev_pos = self.__positions[index]
+
         logger.info(f"Moving drone@{self.drones_addrs[index]}")
         await drone.action.goto_location(*target_position.to_goto_location(prev_pos))
+
+    async def wait_arrival(self,
+                           index,
+                           target_position:DronePosition,
+                           timeout:float,
+                           tolerance_m:float=None,
+                           stop:Callable[[], bool]=None) -> bool:
+        """
+        Waits until the drone identified by its index is within `tolerance_m` from `target_position`,
+        checking its cached position.
+        The wait is abandoned as soon as `stop` (if given) returns True.
+
+        Args:
+            index (int): drone index
+            target_position (DronePosition): position to be reached
+            timeout (float): maximum waiting time [s]
+            tolerance_m (float, optional): horizontal arrival tolerance [m].
+                Defaults to `Swarm.arrival_tolerance_m`.
+            stop (Callable[[], bool], optional): condition to abandon the wait.
+                Defaults to None.
+
+        Returns:
+            bool: True if the drone arrived, False if `timeout` expired or the wait was abandoned before
+        """
+        if tolerance_m is None:
+            tolerance_m = Swarm.arrival_tolerance_m
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            pos = self.__fresh_position(index)
+            if pos is not None and pos.distance_m(target_position) <= tolerance_m:
+                return True
+            if loop.time() >= deadline or (stop is not None and stop()):
+                return False
+            await asyncio.sleep(Swarm.arrival_poll_s)
+
+    async def goto(self,
+                   index,
+                   target_position:DronePosition,
+                   timeout:float,
+                   tolerance_m:float=None,
+                   stop:Callable[[], bool]=None) -> bool:
+        """
+        Moves the drone identified by its index to `target_position` and returns as soon as it arrives,
+        or as soon as `stop` (if given) returns True.
+
+        Returns:
+            bool: True if the drone arrived, False if `timeout` expired or `stop` returned True before
+        """
+        if index >= len(self.__drones):
+            return False
+
+        await self.set_position(index, target_position)
+        arrived = await self.wait_arrival(index, target_position, timeout, tolerance_m, stop)
+        if not arrived and not (stop is not None and stop()):
+            logger.warning(f"drone@{self.drones_addrs[index]} did not reach {target_position} in {timeout}s")
+        return arrived
     
     async def set_positions(self, target_positions:List[DronePosition]):
         """
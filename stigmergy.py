@@ -1,19 +1,27 @@
 import asyncio
-import random
 import itertools
+import time
 
-from typing import List
+from typing import Dict, List, Tuple, TYPE_CHECKING
 from loguru import logger
 
-from models.patch import Patch
-from models.swarm import Swarm
+from models.field import Field, DenseField, SparseField
+from models.coverage import CoverageMap
 from models.pheromone import Pheromone
-from models.droneposition import DronePosition, deg_to_m, m_to_deg
+from models.evaporation import EvaporationModel
+from models.droneposition import DronePosition, deg_to_m
 
 from utils.stigmergy.squareperimeter import calculate_square_boundaries
 from utils.stigmergy.patch import get_patch_coords
 from utils.stigmergy.heatmap import show_heatmap
-from utils.stigmergy.virtualtarget import get_virtual_target
+from utils.stigmergy.virtualtarget import get_virtual_targets
+from utils.stigmergy.waypoints import WaypointTable, get_waypoint_table
+
+if TYPE_CHECKING:
+    # mavsdk is only needed by the caller which builds the swarm
+    from models.swarm import Swarm
+
+WAYPOINTS_BATCH = 16    # random waypoints (virtual targets for the leader) drawn at once for each drone
 
 class Stigmergy:
     """
@@ -22,73 +30,123 @@ class Stigmergy:
     The algorithm leverages the concept of Pheromone in order to signal a target on the flying area to the entire drones swarm. 
     """
 
-    def __init__(self, swarm:Swarm, spawn:DronePosition) -> None:
+    def __init__(self,
+                 swarm:'Swarm',
+                 spawn:DronePosition,
+                 sparse:bool=False,
+                 heatmap:bool=True,
+                 evaporation:EvaporationModel=None) -> None:
         """
-        __field: quantized square map, divided in patches
+        __field: quantized square map, divided in patches (`SparseField` if `sparse`, `DenseField` otherwise)
+        __coverage: visit-time grid of the patches, shared by the swarm to plan the exploration
+        __drone_patches: last patch recorded as visited by each drone, with the visit time
         __swarm: drone swarm associated with the simulation
         __boundaries: physical boundaries of the map (calculated considering the drones spawn position as the center of the square)
+        __waypoints: lookup table from field offsets to waypoints and patches (shared by every simulation on the same field)
+        __next_waypoints: random waypoints already drawn for each drone (virtual targets for the leader)
+        __heatmap: whether the pheromone heatmap is plotted (disable it for headless runs)
+        __evaporation: evaporation model of the released pheromones (defaults to the `Pheromone` one)
         """
-        self.__field: List[List[Patch]] = [[Patch() for _ in range(20)] for _ in range(20)]
+        self.__field: Field = SparseField(20) if sparse else DenseField(20)
+        self.__coverage = CoverageMap(20)
+        self.__drone_patches: Dict[int, Tuple[Tuple[int, int], float]] = {}
         self.__swarm = swarm
         self.__boundaries = calculate_square_boundaries(deg_to_m(spawn.latitude_deg), deg_to_m(spawn.longitude_deg), 100)
+        self.__waypoints: WaypointTable = get_waypoint_table(self.__boundaries[0][0], self.__boundaries[2][1], 100, 20, 490)
+        self.__next_waypoints: Dict[int, List[Tuple[DronePosition, Tuple[int, int]]]] = {}
+        self.__heatmap = heatmap
+        self.__evaporation = evaporation
+
+        # record the visited patches from the streamed telemetry, not only from the 1Hz routine
+        self.__swarm.add_position_listener(self.__on_drone_position)
 
-    def hold_position(self, index:int) -> bool:
+    def __on_drone_position(self, index:int, position:DronePosition) -> None:
+        """
+        Marks as visited the patch the drone identified by its `index` is flying over.
+        The same patch is marked again at most once per second while the drone stays on it.
+        """
+        patch = get_patch_coords(self.__boundaries[0][0], self.__boundaries[2][1], 100, 20, position)
+        now = time.monotonic()
+        last = self.__drone_patches.get(index)
+        if last is None or last[0] != patch or now - last[1] >= 1:
+            self.__drone_patches[index] = (patch, now)
+            self.__coverage.visit(*patch, timestamp=now)
+
+    def hold_position(self, index:int, log:bool=True) -> bool:
         """
         Function to control if a drone has to maintain its position on a patch where it just released a new pheromone.
+        If `log`, the hold is logged.
         Returns:
         - True if it has to maintain it position 
         """
-        for row in self.__field:
-            for patch in row:
-                for pheromone in patch.get_pheromones():
-                    if pheromone.released_by == index:
-                        logger.info(f"[Vehicle {index+1}] holding position on the pheromone track")
-                        return True
-        
+        if self.__field.count_released_by(index) > 0:
+            if log:
+                logger.info(f"[Vehicle {index+1}] holding position on the pheromone track")
+            return True
+
         return False
 
     async def random_swarm_movement(self, index) -> None:
         """
-        Handle the randomic movement of the drones swarm across the map. 
-        Each instance of the function is related to a single drone, identified by `index` 
+        Handle the exploration movement of the drones swarm across the map. 
+        Each instance of the function is related to a single drone, identified by `index`.
+        The drone is sent to the stalest (or never visited) patch not already claimed by another drone;
+        if every patch is claimed, it falls back to a random position.
         """
-        drone_pos = DronePosition(0,0,0)
-
         while True:
             # check if currently the drone has already reached a pheromone track and has still to hold its position
             if not self.hold_position(index):
-                # Update the position based on random velocity
-                new_latitude = self.__boundaries[0][0] + random.randint(0, 99)
-                new_longitude = self.__boundaries[2][1] + random.randint(0, 99)
-
-                drone_pos.latitude_deg = m_to_deg(new_latitude)
-                drone_pos.longitude_deg = m_to_deg(new_longitude)
-                drone_pos.absolute_altitude_m = 490
-
-                # Move the drone to the new position
-                # await drone.action.goto_location(new_latitude, new_longitude, 0, 0)
-                await self.__swarm.set_position(index, drone_pos)
-                await asyncio.sleep(10)
+                last = self.__drone_patches.get(index)
+                cell = self.__coverage.claim(index, near=last[0] if last is not None else None)
+                if cell is not None:
+                    drone_pos = self.__waypoints.patch_waypoint(*cell)
+                else:
+                    drone_pos, _ = self.next_random_waypoint(index)
+
+                # Move the drone to the new position, re-planning as soon as it arrives
+                # or as soon as it is told to hold position on a pheromone track
+                arrived = await self.__swarm.goto(index, drone_pos, timeout=30,
+                                                  stop=lambda: self.hold_position(index, log=False))
+                if arrived and cell is not None:
+                    # mark the patch as soon as it is reached, without waiting for the pheromone routine
+                    self.__coverage.visit(*cell)
             else:
+                self.__coverage.release(index)
                 await asyncio.sleep(2)
 
-    def release_pheromone(self, target:DronePosition, index:int=0):
+    def next_random_waypoint(self, index:int) -> Tuple[DronePosition, Tuple[int, int]]:
+        """
+        Get the next random waypoint, with its patch coordinates, for the drone identified by its `index`.
+        Waypoints are drawn `WAYPOINTS_BATCH` at a time from the waypoint table.
+        The leader uses them as virtual targets; exploring drones only fall back on them when every other patch is claimed.
+        """
+        queue = self.__next_waypoints.get(index)
+        if not queue:
+            queue = self.__next_waypoints[index] = get_virtual_targets(self.__waypoints, WAYPOINTS_BATCH)
+        return queue.pop()
+
+    def release_pheromone(self, target:DronePosition, index:int=0, patch:Tuple[int, int]=None):
         """
         Release a new pheromone on the given `target` position.
         Assign the new pheromone released to a specific drone identified by its `index`.
         This prevents the same drone to release multiple pheromones on the same patch while scanning for pheromones.
+        If `patch` coordinates of the target are already known, they are not computed again.
         """
-        pheromone = Pheromone()
+        pheromone = Pheromone(self.__evaporation)
         pheromone.released_by = index
 
-        x_index, y_index = get_patch_coords(self.__boundaries[0][0], self.__boundaries[2][1], 100, 20, target)
+        if patch is None:
+            patch = get_patch_coords(self.__boundaries[0][0], self.__boundaries[2][1], 100, 20, target)
+        x_index, y_index = patch
         
-        patch = self.__field[x_index][y_index]
-        patch.add_pheromone(pheromone)
+        if not self.__field.add_pheromone(x_index, y_index, pheromone):
+            logger.warning(f"Patch @{x_index, y_index} outside the working field, pheromone not released")
+            return
 
         logger.success(f"Released pheromone @{x_index, y_index}")
 
-        show_heatmap(self.__field)
+        if self.__heatmap:
+            show_heatmap(self.__field)
 
     async def pheromone_routine(self) -> None:
         """
@@ -105,10 +163,10 @@ class Stigmergy:
             drone_patches = [get_patch_coords(self.__boundaries[0][0], self.__boundaries[2][1], 100, 20, d) for d in drone_positions]
             
             for i, p in itertools.islice(enumerate(drone_patches), 1, None):
-                if self.__field[p[0]][p[1]].count_items() > 0:
+                if self.__field.count_items(*p) > 0:
 
                     release_approved = True
-                    pheromones = self.__field[p[0]][p[1]].get_pheromones()
+                    pheromones = self.__field.get_pheromones(*p)
                     for pheromone in pheromones:
                         if pheromone.released_by == i:
                             release_approved = False
@@ -121,18 +179,11 @@ class Stigmergy:
                         # send fly command to the drone to reach the target position and hold
                         await self.__swarm.set_position(i, drone_positions[i])
 
-            # update pheromone intensity due to evaporation
-            for row in self.__field:
-                for patch in row:
-                    pheromones = patch.get_pheromones()
-
-                    for item in pheromones:
-                        is_active = item.tick()
-                        
-                        if(not is_active):
-                            logger.info("Removing vanished PHEROMONE")
-                            patch.filter_pheromones()
-                            show_heatmap(self.__field)
+            # remove the pheromones vanished due to evaporation
+            if self.__field.tick() > 0:
+                logger.info("Removing vanished PHEROMONE")
+                if self.__heatmap:
+                    show_heatmap(self.__field)
 
             await asyncio.sleep(1)
 
@@ -143,13 +194,13 @@ class Stigmergy:
         """
 
         while True:
-            virtual_target = get_virtual_target(self.__boundaries[0][0], self.__boundaries[2][1], 100)
+            virtual_target, target_patch = self.next_random_waypoint(0)
 
-            await self.__swarm.set_position(0, virtual_target)
-            await asyncio.sleep(7)
+            if not await self.__swarm.goto(0, virtual_target, timeout=30):
+                continue
 
             logger.info("[LEADER DRONE] Target reached")
-            self.release_pheromone(virtual_target)
+            self.release_pheromone(virtual_target, patch=target_patch)
 
 
     async def start(self) -> None:
@@ -158,8 +209,8 @@ class Stigmergy:
         Algorithm:
         1 - Swarm Takeoff
         2.1 - "Leader" drone, who can detect the target thanks to the virtual sensing algorithm, starts reaching targets and releasing pheromones
-        2.2 - The whole Swarm start to fly among the working field randomly until some reaches a pheromone track
-        2.3 - A routine is launched every 1 second to handle pheromones evaporation and check drones position, sending instructions if a drone flies over a pheromone track 
+        2.2 - The whole Swarm start to fly among the working field, towards the least recently visited patches, until some reaches a pheromone track
+        2.3 - A routine is launched every 1 second to remove vanished pheromones and check drones position, sending instructions if a drone flies over a pheromone track 
         """
 
         # allow the entire swarm to takeoff
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+
+from typing import List, Tuple
+from loguru import logger
+
+# maximum import time [s] of the modules used by headless runs and sweep workers
+IMPORT_BUDGETS = {
+    "stigmergy": 0.5,
+    "models.field": 0.1,
+    "models.coverage": 0.1,
+    "utils.stigmergy.virtualtarget": 0.1,
+}
+
+# modules which must not be loaded by importing the entry points above
+FORBIDDEN_MODULES = ("matplotlib", "numpy", "PyQt5", "mavsdk")
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(m for m in {forbidden!r} if m in sys.modules))
+"""
+
+def measure_import(module:str) -> Tuple[float, List[str]]:
+    """
+    Imports `module` in a fresh interpreter, so that nothing is already cached
+
+    Returns:
+        Tuple[float, List[str]]: import time [s] and forbidden modules loaded by the import
+    """
+    out = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, forbidden=FORBIDDEN_MODULES)],
+                         capture_output=True, text=True, check=True).stdout.split("\n")
+    return float(out[0]), [m for m in out[1].split(",") if m]
+
+def check_import_budgets() -> bool:
+    """
+    Checks every entry point of `IMPORT_BUDGETS` against its budget
+
+    Returns:
+        bool: True if every entry point respects its budget and loads no forbidden module
+    """
+    ok = True
+    for module, budget in IMPORT_BUDGETS.items():
+        elapsed, loaded = measure_import(module)
+        if elapsed > budget or loaded:
+            logger.error(f"import {module}: {elapsed:.3f}s (budget {budget}s), forbidden modules loaded: {loaded}")
+            ok = False
+        else:
+            logger.info(f"import {module}: {elapsed:.3f}s (budget {budget}s)")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if check_import_budgets() else 1)
@@ -1,29 +1,43 @@
-import matplotlib.pyplot as plt
-import numpy as np
+from loguru import logger
 
-from typing import List
-from models.patch import Patch
+from models.field import Field
 
-def show_heatmap(field: List[List[Patch]]) -> None:
+# matplotlib (and its Qt backend) is imported on the first plot only,
+# so that headless runs neither pay its import time nor need a display stack
+_gui_available = None
 
-    num_rows = len(field)
-    num_cols = len(field[0])
+def show_heatmap(field: Field) -> None:
+    global _gui_available
+
+    if _gui_available is False:
+        return
+    try:
+        import matplotlib.pyplot as plt
+        import numpy as np
+    except ImportError:
+        logger.warning("matplotlib not available, pheromone heatmap disabled")
+        _gui_available = False
+        return
+    _gui_available = True
+
+    num_rows = field.total_patches
+    num_cols = field.total_patches
 
     heatmap_data = np.zeros((num_rows, num_cols))
 
-    for i, row in enumerate(field):
-        for j, patch in enumerate(row):
+    for (i, j), patch in field.items():
+        if 0 <= i < num_rows and 0 <= j < num_cols:
             heatmap_data[i, j] = sum(pheromone.get_intensity for pheromone in patch.get_pheromones())
 
     plt.clf()
     plot = plt.imshow(heatmap_data, cmap='YlOrRd', interpolation='nearest')
     plt.colorbar(plot, label="Patch Pheromones Intensity")
     plt.grid(visible=True, which='both', linestyle='-', linewidth=1, color='black')
-    plt.xticks(range(len(field[0])), range(len(field[0])))
-    plt.yticks(range(len(field)), range(len(field)))
+    plt.xticks(range(num_cols), range(num_cols))
+    plt.yticks(range(num_rows), range(num_rows))
     plt.gca().invert_yaxis()
     plt.title("Pheromone Heatmap")
 
     plt.show(block = False)
 
-    plt.pause(1)
\ No newline at end of file
+    plt.pause(1)
@@ -24,5 +24,3 @@ def get_patch_coords(lower_bound_x,
     y_index = math.floor((pos_y_m - lower_bound_y) / patch_length)
 
     return (x_index, y_index)
-
-    
\ No newline at end of file
@@ -1,20 +1,12 @@
-import random
+from typing import List, Tuple
 
-from models.swarm import Swarm
-from models.droneposition import DronePosition, m_to_deg
+from models.droneposition import DronePosition
+from utils.stigmergy.waypoints import WaypointTable
 
-def get_virtual_target(lower_bound_x, lower_bound_y, side_length) -> DronePosition:
+def get_virtual_targets(waypoints:WaypointTable, k:int) -> List[Tuple[DronePosition, Tuple[int, int]]]:
     """
-    Creates a new random virtual target inside the specified working field.
-    """
-    virtual_target = DronePosition(0,0,0)
-
-    # Update the position based on random velocity
-    new_latitude = lower_bound_x + random.randint(0, side_length-1)
-    new_longitude = lower_bound_y + random.randint(0, side_length-1)
+    Creates `k` new random virtual targets inside the working field described by `waypoints`.
 
-    virtual_target.latitude_deg = m_to_deg(new_latitude)
-    virtual_target.longitude_deg = m_to_deg(new_longitude)
-    virtual_target.absolute_altitude_m = 490
-
-    return virtual_target
+    Returns: virtual target positions with their patch coordinates
+    """
+    return waypoints.sample(k)
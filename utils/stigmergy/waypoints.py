@@ -0,0 +1,80 @@
+import math
+import random
+
+from functools import lru_cache
+from typing import List, Tuple
+
+from models.droneposition import DronePosition, m_to_deg
+from utils.stigmergy.patch import get_patch_coords
+
+class WaypointTable:
+    """
+    Lookup tables of the working field, mapping integer metre offsets from the lower bounds
+    to latitude/longitude [deg] and to patch indices.
+    Built once per field geometry (see `get_waypoint_table`), so that sampling a waypoint
+    needs no float conversion nor `get_patch_coords` call.
+    Patch indices are computed with `get_patch_coords` on the table waypoints, so that they
+    match the patches detected from the drones telemetry.
+    """
+    def __init__(self,
+                 lower_bound_x,
+                 lower_bound_y,
+                 side_length:int,
+                 total_patches:int,
+                 altitude_m:float) -> None:
+        self.side_length = side_length
+        self.altitude_m = altitude_m
+        self.__patch_length = math.ceil(side_length/total_patches)
+        self.__latitudes_deg = [m_to_deg(lower_bound_x + i) for i in range(side_length)]
+        self.__longitudes_deg = [m_to_deg(lower_bound_y + i) for i in range(side_length)]
+        # latitude only affects the X patch index and longitude only the Y one
+        self.__patch_indices_x = [get_patch_coords(lower_bound_x, lower_bound_y, side_length, total_patches,
+                                                   DronePosition(lat, self.__longitudes_deg[0], altitude_m))[0]
+                                  for lat in self.__latitudes_deg]
+        self.__patch_indices_y = [get_patch_coords(lower_bound_x, lower_bound_y, side_length, total_patches,
+                                                   DronePosition(self.__latitudes_deg[0], lon, altitude_m))[1]
+                                  for lon in self.__longitudes_deg]
+
+    def waypoint(self, x_offset:int, y_offset:int) -> DronePosition:
+        """
+        Get the position at the given offsets [m] from the lower bounds of the working field
+        """
+        return DronePosition(self.__latitudes_deg[x_offset], self.__longitudes_deg[y_offset], self.altitude_m)
+
+    def patch_coords(self, x_offset:int, y_offset:int) -> Tuple[int, int]:
+        """
+        Get the patch coordinates at the given offsets [m] from the lower bounds of the working field
+        """
+        return (self.__patch_indices_x[x_offset], self.__patch_indices_y[y_offset])
+
+    def patch_waypoint(self, x_index:int, y_index:int) -> DronePosition:
+        """
+        Get the position of the center of the patch at (`x_index`, `y_index`)
+        """
+        half = self.__patch_length // 2
+        x_offset = min(x_index * self.__patch_length + half, self.side_length - 1)
+        y_offset = min(y_index * self.__patch_length + half, self.side_length - 1)
+        return self.waypoint(x_offset, y_offset)
+
+    def sample(self, k:int) -> List[Tuple[DronePosition, Tuple[int, int]]]:
+        """
+        Draws `k` random waypoints inside the working field
+
+        Returns:
+            List[Tuple[DronePosition, Tuple[int, int]]]: waypoints with their patch coordinates
+        """
+        offsets = range(self.side_length)
+        xs = random.choices(offsets, k=k)
+        ys = random.choices(offsets, k=k)
+        return [(self.waypoint(x, y), self.patch_coords(x, y)) for x, y in zip(xs, ys)]
+
+@lru_cache(maxsize=None)
+def get_waypoint_table(lower_bound_x,
+                       lower_bound_y,
+                       side_length:int,
+                       total_patches:int,
+                       altitude_m:float) -> WaypointTable:
+    """
+    Returns the `WaypointTable` of the given field geometry, building it on the first call only
+    """
+    return WaypointTable(lower_bound_x, lower_bound_y, side_length, total_patches, altitude_m)